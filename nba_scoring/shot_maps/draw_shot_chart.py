@@ -1,47 +1,202 @@
+import math
+from functools import lru_cache
+
+import numpy as np
 import matplotlib as mpl
 from matplotlib.colors import LogNorm
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+
+# Numba compiles the per-point bin assignment to a parallel native loop,
+# which pays off when hex maps are drawn many times (per player/team/season)
+try:
+    from numba import njit, prange, get_num_threads
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+
+def _configure_style():
+    # Each rcParams write re-runs validators and invalidates font caches,
+    # so set them exactly once per process rather than per chart
+    mpl.rcParams['font.family'] = 'Avenir'
+    mpl.rcParams['font.size'] = 18
+    mpl.rcParams['axes.linewidth'] = 2
+
+
+_configure_style()
+
+
+@lru_cache(maxsize=1)
+def _build_court_paths():
+    """
+    Court markings as Path objects, in the same coords as the old plot
+    calls. Built once per process; the paths are immutable and each axis
+    gets its own PathCollection around them, so sharing is safe.
+    """
+    segments = [
+        [(-220, 0), (-220, 140)],   # corner-three lines
+        [(220, 0), (220, 140)],
+        [(-80, 0), (-80, 190)],     # outer paint
+        [(80, 0), (80, 190)],
+        [(-60, 0), (-60, 190)],     # inner paint
+        [(60, 0), (60, 190)],
+        [(-80, 190), (80, 190)],    # free-throw line
+        [(-30, 40), (30, 40)],      # backboard
+    ]
+    paths = [Path(seg) for seg in segments]
+
+    # Three-point arc: upper half of a 440x315 ellipse centered on (0, 140)
+    arc = Path.arc(0, 180)
+    paths.append(Path(arc.vertices * [220.0, 157.5] + [0.0, 140.0], arc.codes))
+    paths.append(Path.circle((0, 190), 60))  # free-throw circle
+    paths.append(Path.circle((0, 60), 15))   # rim
+    return paths
 
 
 def create_court(ax, color):
-    ax.plot([-220, -220], [0, 140], linewidth=2, color=color)
-    ax.plot([220, 220], [0, 140], linewidth=2, color=color)
-    ax.add_artist(mpl.patches.Arc((0, 140), 440, 315, theta1=0, theta2=180, facecolor='none', edgecolor=color, lw=2))
-    ax.plot([-80, -80], [0, 190], linewidth=2, color=color)
-    ax.plot([80, 80], [0, 190], linewidth=2, color=color)
-    ax.plot([-60, -60], [0, 190], linewidth=2, color=color)
-    ax.plot([60, 60], [0, 190], linewidth=2, color=color)
-    ax.plot([-80, 80], [190, 190], linewidth=2, color=color)
-    ax.add_artist(mpl.patches.Circle((0, 190), 60, facecolor='none', edgecolor=color, lw=2))
-    ax.add_artist(mpl.patches.Circle((0, 60), 15, facecolor='none', edgecolor=color, lw=2))
-    ax.plot([-30, 30], [40, 40], linewidth=2, color=color)
+    # One batched collection per axis instead of 13 individual artists
+    ax.add_collection(PathCollection(_build_court_paths(), edgecolors=color,
+                                     facecolors='none', linewidths=2))
     ax.set_xlim(-250, 250)
     ax.set_ylim(0, 470)
     ax.set_xticks([])
     ax.set_yticks([])
-    mpl.rcParams['font.family'] = 'Avenir'
-    mpl.rcParams['font.size'] = 18
-    mpl.rcParams['axes.linewidth'] = 2
 
 def draw_shots(ax, df):
-    made_shots = df[df['SHOT_MADE_FLAG'] == 1]
-    missed_shots = df[df['SHOT_MADE_FLAG'] == 0]
+    # Mask the three columns we actually plot rather than slicing the full
+    # frame twice, which copies every column just to feed scatter x/y
+    made = df['SHOT_MADE_FLAG'].to_numpy(dtype=bool)
+    x = df['LOC_X'].to_numpy()
+    y = df['LOC_Y'].to_numpy() + 60  # shift to half-court coords
+
+    # Each group is a single color, so Line2D markers via ax.plot beat
+    # scatter's per-point PathCollection; rasterize so saved figures store
+    # the dots as one image instead of hundreds of thousands of vectors
+    for mask, color in ((made, 'green'), (~made, 'red')):
+        ax.plot(x[mask], y[mask], linestyle='none', marker='o',
+                markersize=math.sqrt(10), markerfacecolor=color,
+                markeredgecolor='none', alpha=0.6, rasterized=True)
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _rint(v):
+        # Round half to even, matching np.round and ax.hexbin: integer LOC
+        # coordinates land exactly on half-integer lattice positions, so
+        # truncation-style rounding would bin them differently from the
+        # numpy fallback
+        r = math.floor(v + 0.5)
+        if r - v == 0.5 and r % 2 != 0:
+            r -= 1
+        return int(r)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _hexbin_counts_kernel(x, y, nx, ny, xmin, ymin, sx, sy, nchunks):
+        # Per-chunk local histograms avoid contended atomic increments;
+        # they are summed once at the end
+        n1 = (nx + 1) * (ny + 1)
+        total = n1 + nx * ny
+        local = np.zeros((nchunks, total), dtype=np.int64)
+        npts = x.shape[0]
+        chunk = (npts + nchunks - 1) // nchunks
+        for c in prange(nchunks):
+            start = c * chunk
+            stop = min(start + chunk, npts)
+            for k in range(start, stop):
+                fx = (x[k] - xmin) / sx
+                fy = (y[k] - ymin) / sy
+                # callers mask out-of-extent points, so only the max edge
+                # needs clamping (points exactly on it floor to the last cell)
+                i1 = _rint(fx)
+                j1 = _rint(fy)
+                i2 = min(int(fx), nx - 1)
+                j2 = min(int(fy), ny - 1)
+                d1 = (fx - i1) ** 2 + 3.0 * (fy - j1) ** 2
+                d2 = (fx - i2 - 0.5) ** 2 + 3.0 * (fy - j2 - 0.5) ** 2
+                if d1 < d2:
+                    local[c, i1 * (ny + 1) + j1] += 1
+                else:
+                    local[c, n1 + i2 * ny + j2] += 1
+        return local.sum(axis=0)
+
+def _hexbin_counts(x, y, gridsize, extent):
+    """
+    Bin points onto matplotlib's hexbin lattice and return one
+    (center_x, center_y, count) triple per occupied hexagon
+    """
+    xmin, xmax, ymin, ymax = extent
+    nx = gridsize
+    ny = int(nx / math.sqrt(3))
+    sx = (xmax - xmin) / nx
+    sy = (ymax - ymin) / ny
 
-    ax.scatter(made_shots['LOC_X'], made_shots['LOC_Y'] + 60, c='green', s=10, alpha=0.6)
-    ax.scatter(missed_shots['LOC_X'], missed_shots['LOC_Y'] + 60, c='red', s=10, alpha=0.6)
+    # hexbin drops points outside the extent rather than folding them into
+    # edge bins; do the same (backcourt heaves land above ymax)
+    inside = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+    if not inside.all():
+        x = x[inside]
+        y = y[inside]
+
+    if _HAVE_NUMBA:
+        flat = _hexbin_counts_kernel(
+            np.ascontiguousarray(x, dtype=np.float64),
+            np.ascontiguousarray(y, dtype=np.float64),
+            nx, ny, xmin, ymin, sx, sy, get_num_threads(),
+        )
+        counts1 = flat[:(nx + 1) * (ny + 1)].reshape(nx + 1, ny + 1)
+        counts2 = flat[(nx + 1) * (ny + 1):].reshape(nx, ny)
+    else:
+        ix = (x - xmin) / sx
+        iy = (y - ymin) / sy
+        ix1 = np.round(ix).astype(np.intp)
+        iy1 = np.round(iy).astype(np.intp)
+        # points exactly on the max edge floor into the last cell
+        ix2 = np.minimum(np.floor(ix).astype(np.intp), nx - 1)
+        iy2 = np.minimum(np.floor(iy).astype(np.intp), ny - 1)
+
+        # hexbin's lattice is two offset rectangular grids; each point goes
+        # to whichever of its two candidate centers is nearer
+        d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+        d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+        first = d1 < d2
+
+        counts1 = np.zeros((nx + 1, ny + 1), dtype=np.intp)
+        counts2 = np.zeros((nx, ny), dtype=np.intp)
+        np.add.at(counts1, (ix1[first], iy1[first]), 1)
+        np.add.at(counts2, (ix2[~first], iy2[~first]), 1)
+
+    jx1, jy1 = np.nonzero(counts1)
+    jx2, jy2 = np.nonzero(counts2)
+    cx = np.concatenate([xmin + jx1 * sx, xmin + (jx2 + 0.5) * sx])
+    cy = np.concatenate([ymin + jy1 * sy, ymin + (jy2 + 0.5) * sy])
+    counts = np.concatenate([counts1[jx1, jy1], counts2[jx2, jy2]])
+    return cx, cy, counts
 
 def draw_shots_hex(ax, df, gridsize=25, mincount=200):
     x = df["LOC_X"].to_numpy()
     y = (df["LOC_Y"] + 60).to_numpy()  # shift to half-court coords
+    extent = [-250, 250, 0, 470]
+
+    # Pre-bin so hexbin only sees one weighted point per occupied hex
+    # instead of re-binning every raw shot on each draw
+    cx, cy, counts = _hexbin_counts(x, y, gridsize, extent)
+    keep = counts >= mincount
+    kept = counts[keep]
+
+    # Fix the norm bounds up front so matplotlib never walks the counts
+    # again to autoscale (once per draw/colorbar otherwise)
+    vmax = kept.max() if len(kept) else mincount + 1
 
     hb = ax.hexbin(
-        x, y,
+        cx[keep], cy[keep],
+        C=kept,
+        reduce_C_function=np.sum,
         gridsize=gridsize,
-        extent=[-250, 250, 0, 470],
-        mincnt=mincount,
+        extent=extent,
         linewidths=0,
         edgecolors='none',
         cmap='plasma',
-        norm=LogNorm(),
+        norm=LogNorm(vmin=mincount, vmax=vmax),
     )
 
     return hb
\ No newline at end of file
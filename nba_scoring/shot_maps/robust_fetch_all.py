@@ -1,105 +1,294 @@
 import os
+import glob
 import time
+import shutil
+import logging
+import threading
+import numpy as np
 import pandas as pd
-from datetime import datetime
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.exceptions import RequestException
 from nba_api.stats.static import teams
 from nba_api.stats.endpoints import shotchartdetail
 
+# One handler flush per log record instead of a syscall per print line
+logger = logging.getLogger(__name__)
+
+# orjson decodes the multi-megabyte shotchart payloads 2-3x faster than the
+# stdlib parser; patch the one place nba_api parses a response body so its
+# single parse goes through orjson instead of adding a second one of our own
+try:
+    import orjson
+    from nba_api.library import http as _nba_http
+
+    def _orjson_get_dict(self):
+        return orjson.loads(self.get_response())
+
+    _nba_http.NBAResponse.get_dict = _orjson_get_dict
+except ImportError:
+    pass
+
+# Cache raw NBA API responses on disk so retrying a partially-complete
+# season serves the already-fetched teams from SQLite instead of the network
+try:
+    import requests_cache
+    requests_cache.install_cache('nba_api_cache', backend='sqlite', expire_after=timedelta(days=7))
+except ImportError:
+    requests_cache = None
+    # warning, not info: this runs at import time, before any logging
+    # config exists, and the last-resort handler drops INFO records
+    logger.warning("requests_cache not installed; reruns will re-hit the NBA API")
+
+# Worker threads overlap HTTP wait time; the token bucket below still caps
+# the global request rate so we stay polite to stats.nba.com
+MAX_WORKERS = 3
+
+# A transient timeout shouldn't permanently drop a team; retry with
+# exponential backoff before giving up
+MAX_RETRIES = 5
+
+
+# Columns kept from the ~24 the endpoint returns: what plotting and the
+# summary prints use. Extend this list if you need more downstream.
+SHOT_COLUMNS = ['GAME_ID', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID',
+                'LOC_X', 'LOC_Y', 'SHOT_MADE_FLAG', 'SHOT_ZONE_BASIC',
+                'SHOT_DISTANCE', 'ACTION_TYPE']
+
+# The API hands every numeric column back as int64; these all fit in far
+# narrower types, which shrinks the season-long concat and every to_numpy()
+_INT16_COLS = ['LOC_X', 'LOC_Y', 'SHOT_DISTANCE']
+_INT8_COLS = ['SHOT_MADE_FLAG', 'SHOT_ATTEMPTED_FLAG', 'PERIOD',
+              'MINUTES_REMAINING', 'SECONDS_REMAINING']
+
+
+class _TokenBucket:
+    """Allow one request per `interval` seconds across all threads"""
+
+    FLOOR = 0.3       # fastest pace after a streak of clean responses
+    PENALTY = 5.0     # pace right after the API pushes back
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(self._next_slot, now) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def reward(self):
+        # Speed back up gradually while responses stay clean
+        with self._lock:
+            self.interval = max(self.FLOOR, self.interval * 0.9)
+
+    def penalize(self):
+        with self._lock:
+            self.interval = self.PENALTY
+
+
+def _fetch_team(team, season, bucket):
+    """Fetch one team's shot chart, retrying transient failures with backoff"""
+    backoff = 2.0
+    bypass_cache = False
+    for attempt in range(MAX_RETRIES):
+        bucket.acquire()
+        try:
+            if bypass_cache and requests_cache is not None:
+                # A throttled 200 with a garbage body gets cached like any
+                # other response, so a plain retry would re-read the same
+                # poisoned entry. disabled() is process-wide, meaning another
+                # worker's response may briefly go uncached — harmless.
+                with requests_cache.disabled():
+                    df = _fetch_team_df(team, season)
+            else:
+                df = _fetch_team_df(team, season)
+        except (RequestException, ValueError) as e:
+            # Timeouts and throttled (garbage) responses are worth retrying;
+            # anything else propagates to the failed_teams path immediately
+            bucket.penalize()
+            bypass_cache = bypass_cache or isinstance(e, ValueError)
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+        else:
+            bucket.reward()
+            return df
+
+
+def _frame_from_response(shot_data):
+    """
+    Build the shot frame from nba_api's already-parsed result set (the
+    endpoint parses the body exactly once while loading), skipping the
+    row-tuple DataFrame construction in get_data_frames. The frame lands
+    already narrowed to SHOT_COLUMNS with the compact dtypes.
+    """
+    result = shot_data.shot_chart_detail.get_dict()
+    rows = result['data']
+    if not rows:
+        return pd.DataFrame(columns=SHOT_COLUMNS)
+
+    index = {header: i for i, header in enumerate(result['headers'])}
+    columns = {}
+    for name in SHOT_COLUMNS:
+        values = [row[index[name]] for row in rows]
+        if name in _INT16_COLS:
+            columns[name] = np.asarray(values, dtype=np.int16)
+        elif name in _INT8_COLS:
+            columns[name] = np.asarray(values, dtype=np.int8)
+        else:
+            columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def _checkpoint_team(progress_dir, team_id, df):
+    """Durably write one team's checkpoint (temp file, then atomic rename)"""
+    path = os.path.join(progress_dir, f'team_{team_id}.parquet')
+    tmp = path + '.tmp'
+    df.to_parquet(tmp, compression='zstd', index=False)
+    os.replace(tmp, path)
+
+
+def _fetch_team_df(team, season):
+    """Fetch one team's shot chart (single attempt, no rate limiting)"""
+    shot_data = shotchartdetail.ShotChartDetail(
+        team_id=team['id'],
+        player_id=0,  # 0 gets all players on the team
+        context_measure_simple='FGA',
+        season_nullable=season,
+        season_type_all_star='Regular Season'
+    )
+    return _frame_from_response(shot_data)
+
 
 def get_all_shots_season(season='2025-26', delay=0.6, save_every=5):
     """
-    Fetch all shot data for the specified season and save to CSV
-    
+    Fetch all shot data for the specified season and save to Parquet
+
     Parameters:
     - season: NBA season (e.g., '2025-26')
     - delay: Delay between API calls (seconds)
-    - save_every: Save progress every N teams
-    
+    - save_every: Log a running shot total every N teams (progress itself
+      is checkpointed after every team)
+
     Returns:
-    - DataFrame with all shot data
+    - DataFrame with all shot data, or None if the season file already exists
     """
-    # Check if season already complete
-    output_file = f'nba_shots_{season}_all.csv'
+    # Check if season already complete; the parquet footer has the row
+    # count, so don't materialize the whole frame just to skip the season
+    output_file = f'nba_shots_{season}_all.parquet'
     if os.path.exists(output_file):
-        print(f"✓ Season {season} already exists at {output_file}, skipping...")
-        return pd.read_csv(output_file)
+        rows = pq.ParquetFile(output_file).metadata.num_rows
+        logger.info(f"✓ Season {season} already exists at {output_file} ({rows:,} shots), skipping...")
+        return None
     
     # Get all teams
     all_teams = teams.get_teams()
     
-    print(f"Starting shot data collection")
-    print(f"Season: {season}")
-    print(f"Total teams: {len(all_teams)}")
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-" * 60)
+    logger.info(f"Starting shot data collection")
+    logger.info(f"Season: {season}")
+    logger.info(f"Total teams: {len(all_teams)}")
+    logger.info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("-" * 60)
     
     all_shots = []
     failed_teams = []
-    
-    for i, team in enumerate(all_teams, 1):
-        team_id = team['id']
-        team_name = team['full_name']
-        
+
+    # One parquet checkpoint per team, each written to a temp name and
+    # atomically renamed: a crash at any point (even a hard kill) can never
+    # corrupt the teams already on disk. Total bytes written stay O(rows),
+    # and dtypes survive the round trip
+    progress_dir = f'nba_shots_{season}_progress'
+    os.makedirs(progress_dir, exist_ok=True)
+    done = set()
+
+    # Resume from an interrupted run: teams already checkpointed are kept
+    # and never re-fetched, and nothing already on disk is rewritten
+    for path in sorted(glob.glob(os.path.join(progress_dir, 'team_*.parquet'))):
         try:
-            # Fetch shot data for this team (all players on the team)
-            shot_data = shotchartdetail.ShotChartDetail(
-                team_id=team_id,
-                player_id=0,  # 0 gets all players on the team
-                context_measure_simple='FGA',
-                season_nullable=season,
-                season_type_all_star='Regular Season'
-            )
-            
-            df = shot_data.get_data_frames()[0]
-            
-            if len(df) > 0:
-                all_shots.append(df)
-                print(f"[{i}/{len(all_teams)}] {team_name}: {len(df)} shots")
-            else:
-                print(f"[{i}/{len(all_teams)}] {team_name}: No shots")
-            
-            # Save progress periodically
-            if i % save_every == 0 and all_shots:
-                temp_df = pd.concat(all_shots, ignore_index=True)
-                temp_df.to_csv(f'nba_shots_{season}_progress.csv', index=False)
-                print(f"  → Progress saved: {len(temp_df)} total shots so far")
-            
-            # Rate limiting
-            time.sleep(delay)
-            
-        except Exception as e:
-            failed_teams.append((team_name, str(e)))
-            print(f"[{i}/{len(all_teams)}] {team_name}: FAILED - {str(e)}")
-            time.sleep(delay)
+            prior = pd.read_parquet(path)
+        except Exception:
+            os.remove(path)  # damaged checkpoint; refetch just this team
+            continue
+        all_shots.append(prior)
+        done.add(int(os.path.basename(path)[len('team_'):-len('.parquet')]))
+
+    # Leftover temp files are partial writes from a hard kill
+    for tmp in glob.glob(os.path.join(progress_dir, 'team_*.parquet.tmp')):
+        os.remove(tmp)
+
+    if done:
+        logger.info(f"Resuming: {len(done)} teams already fetched ({sum(len(d) for d in all_shots)} shots)")
+
+    # One request per `delay` seconds globally, spread across the workers
+    bucket = _TokenBucket(delay)
+    pending = [team for team in all_teams if team['id'] not in done]
+    total_pending = len(pending)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(_fetch_team, team, season, bucket): team
+            for team in pending
+        }
+
+        for i, future in enumerate(as_completed(futures), 1):
+            team = futures[future]
+            team_name = team['full_name']
+
+            try:
+                df = future.result()
+
+                if len(df) > 0:
+                    all_shots.append(df)
+                    # Checkpoint just this team's shots instead of
+                    # rewriting everything collected so far
+                    _checkpoint_team(progress_dir, team['id'], df)
+                    logger.info(f"[{i}/{total_pending}] {team_name}: {len(df)} shots")
+                else:
+                    logger.info(f"[{i}/{total_pending}] {team_name}: No shots")
+
+                if i % save_every == 0 and all_shots:
+                    logger.info(f"  → Running total: {sum(len(d) for d in all_shots)} shots so far")
+
+            except Exception as e:
+                failed_teams.append((team_name, str(e)))
+                logger.info(f"[{i}/{total_pending}] {team_name}: FAILED - {str(e)}")
     
-    print("-" * 60)
-    print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("-" * 60)
+    logger.info(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     if failed_teams:
-        print(f"\nFailed to fetch data for {len(failed_teams)} teams:")
+        logger.info(f"\nFailed to fetch data for {len(failed_teams)} teams:")
         for name, error in failed_teams:
-            print(f"  - {name}: {error}")
+            logger.info(f"  - {name}: {error}")
     
-    # Combine all shots
+    # Combine all shots (single concat at the end; interim concats are O(N²))
     if all_shots:
-        combined_df = pd.concat(all_shots, ignore_index=True)
-        print(f"\n✓ Total shots collected: {len(combined_df):,}")
-        print(f"✓ Teams with shots: {len(all_shots)}")
-        print(f"✓ Unique games: {combined_df.GAME_ID.nunique()}")
-        print(f"✓ Unique players: {combined_df.PLAYER_NAME.nunique()}")
+        if len(all_shots) == 1:
+            combined_df = all_shots[0]
+        else:
+            combined_df = pd.concat(all_shots, ignore_index=True, copy=False)
+        logger.info(f"\n✓ Total shots collected: {len(combined_df):,}")
+        logger.info(f"✓ Teams with shots: {len(all_shots)}")
+        logger.info(f"✓ Unique games: {combined_df.GAME_ID.nunique()}")
+        logger.info(f"✓ Unique players: {combined_df.PLAYER_NAME.nunique()}")
         
         # Save final dataset
-        combined_df.to_csv(output_file, index=False)
-        print(f"\n✓ Saved to: {output_file}")
-        
-        # Clean up progress file
-        progress_file = f'nba_shots_{season}_progress.csv'
-        if os.path.exists(progress_file):
-            os.remove(progress_file)
-        
+        combined_df.to_parquet(output_file, compression='zstd', index=False)
+        logger.info(f"\n✓ Saved to: {output_file}")
+
+        # Clean up progress checkpoints
+        shutil.rmtree(progress_dir, ignore_errors=True)
+
         return combined_df
     else:
-        print("\n✗ No shot data collected!")
+        logger.info("\n✗ No shot data collected!")
         return pd.DataFrame()
 
 
@@ -111,73 +300,79 @@ def get_all_seasons(start_year=2000, end_year=2025, delay=0.6, save_every=5):
     - start_year: First season year (e.g., 2000 for 2000-01)
     - end_year: Last season year (e.g., 2025 for 2025-26)
     - delay: Delay between API calls (seconds)
-    - save_every: Save progress every N teams
+    - save_every: Log a running shot total every N teams
     """
-    overall_start = datetime.now()
+    # Wall clock only for the banner; monotonic for elapsed arithmetic
+    overall_start = time.monotonic()
     total_seasons = end_year - start_year + 1
-    
-    print(f"{'='*60}")
-    print(f"FETCHING {total_seasons} SEASONS ({start_year}-{str(start_year-2000+1).zfill(2)} to {end_year}-{str(end_year-2000+1).zfill(2)})")
-    print(f"Started at: {overall_start.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}\n")
+
+    logger.info(f"{'='*60}")
+    logger.info(f"FETCHING {total_seasons} SEASONS ({start_year}-{str(start_year-2000+1).zfill(2)} to {end_year}-{str(end_year-2000+1).zfill(2)})")
+    logger.info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info(f"{'='*60}\n")
     
     results = {}
     
     for year in range(start_year, end_year + 1):
         season_str = f"{year}-{str(year-2000+1).zfill(2)}"
         
-        print(f"\n{'#'*60}")
-        print(f"SEASON {season_str} ({year - start_year + 1}/{total_seasons})")
-        print(f"{'#'*60}\n")
+        logger.info(f"\n{'#'*60}")
+        logger.info(f"SEASON {season_str} ({year - start_year + 1}/{total_seasons})")
+        logger.info(f"{'#'*60}\n")
         
         try:
             df = get_all_shots_season(season=season_str, delay=delay, save_every=save_every)
+            season_file = f'nba_shots_{season_str}_all.parquet'
+            if df is None:  # already on disk; count rows from the footer
+                shots = pq.ParquetFile(season_file).metadata.num_rows
+            else:
+                shots = len(df)
             results[season_str] = {
                 'success': True,
-                'shots': len(df),
-                'file': f'nba_shots_{season_str}_all.csv'
+                'shots': shots,
+                'file': season_file
             }
         except Exception as e:
-            print(f"\n✗✗ SEASON {season_str} FAILED: {str(e)}")
+            logger.info(f"\n✗✗ SEASON {season_str} FAILED: {str(e)}")
             results[season_str] = {
                 'success': False,
                 'error': str(e)
             }
         
         # Print progress summary
-        elapsed = datetime.now() - overall_start
+        elapsed = timedelta(seconds=time.monotonic() - overall_start)
         seasons_done = year - start_year + 1
         seasons_left = total_seasons - seasons_done
         avg_per_season = elapsed / seasons_done
         est_remaining = avg_per_season * seasons_left
         
-        print(f"\n{'='*60}")
-        print(f"OVERALL PROGRESS: {seasons_done}/{total_seasons} seasons")
-        print(f"Elapsed: {elapsed}")
-        print(f"Est. remaining: {est_remaining}")
-        print(f"{'='*60}\n")
+        logger.info(f"\n{'='*60}")
+        logger.info(f"OVERALL PROGRESS: {seasons_done}/{total_seasons} seasons")
+        logger.info(f"Elapsed: {elapsed}")
+        logger.info(f"Est. remaining: {est_remaining}")
+        logger.info(f"{'='*60}\n")
     
     # Final summary
-    overall_end = datetime.now()
-    print(f"\n{'='*60}")
-    print(f"ALL SEASONS COMPLETE!")
-    print(f"Total time: {overall_end - overall_start}")
-    print(f"{'='*60}\n")
+    logger.info(f"\n{'='*60}")
+    logger.info(f"ALL SEASONS COMPLETE!")
+    logger.info(f"Total time: {timedelta(seconds=time.monotonic() - overall_start)}")
+    logger.info(f"{'='*60}\n")
     
-    print("Summary:")
+    logger.info("Summary:")
     total_shots = 0
     for season, info in results.items():
         if info['success']:
-            print(f"  ✓ {season}: {info['shots']:,} shots → {info['file']}")
+            logger.info(f"  ✓ {season}: {info['shots']:,} shots → {info['file']}")
             total_shots += info['shots']
         else:
-            print(f"  ✗ {season}: FAILED - {info['error']}")
+            logger.info(f"  ✗ {season}: FAILED - {info['error']}")
     
-    print(f"\nTotal shots collected: {total_shots:,}")
+    logger.info(f"\nTotal shots collected: {total_shots:,}")
     
     return results
 
 
 # Run the collection
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
     results = get_all_seasons(start_year=2000, end_year=2025, delay=0.6, save_every=5)
\ No newline at end of file